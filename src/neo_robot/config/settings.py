@@ -21,4 +21,5 @@ class AppConfig:
 
     hardware: HardwareConfig = field(default_factory=HardwareConfig)
     editor_theme: str = "monokai"
+    run_timeout: float | None = 60.0  # seconds before student code is aborted; None = no limit
     app_title: str = "NEO Robot - Learn Python with Robotics"
@@ -6,6 +6,14 @@ import time
 from typing import Any, Callable
 
 
+def _noop(msg: str) -> None:  # pragma: no cover
+    """Default no-op logger used when no callback is provided."""
+
+
+def _noop_flush() -> None:  # pragma: no cover
+    """Default no-op flush used when no callback is provided."""
+
+
 # ---------------------------------------------------------------------------
 # Student-facing API
 # ---------------------------------------------------------------------------
@@ -17,62 +25,113 @@ class StudentArmAPI:
     (real hardware or mock) and provides a flat, beginner-friendly API.
     """
 
-    def __init__(self, robot: Any, log: Callable[[str], None] | None = None) -> None:
+    __slots__ = (
+        "_robot",
+        "_log",
+        "_log_enabled",
+        "_flush",
+        "_sleep",
+        "_upper_turn_left",
+        "_upper_turn_right",
+        "_upper_set_angle",
+        "_lower_turn_left",
+        "_lower_turn_right",
+        "_lower_set_angle",
+        "_hand_grab",
+        "_hand_release",
+    )
+
+    def __init__(
+        self,
+        robot: Any,
+        log: Callable[[str], None] | None = None,
+        flush: Callable[[], None] | None = None,
+        sleep: Callable[[float], None] | None = None,
+    ) -> None:
         self._robot = robot
-        self._log = log or (lambda _: None)
+        self._log = log if log is not None else _noop
+        # Skip building log strings entirely when nobody is listening.
+        self._log_enabled = log is not None
+        # Called before blocking so any buffered log lines reach the UI.
+        self._flush = flush if flush is not None else _noop_flush
+        # Lets the executor end a ``delay`` early when the run is stopped.
+        self._sleep = sleep if sleep is not None else time.sleep
+        # Bind the joint methods once so each call skips the
+        # ``robot.<joint>.<method>`` attribute chain.
+        self._upper_turn_left = robot.upper_arm.turn_left
+        self._upper_turn_right = robot.upper_arm.turn_right
+        self._upper_set_angle = robot.upper_arm.set_angle
+        self._lower_turn_left = robot.lower_arm.turn_left
+        self._lower_turn_right = robot.lower_arm.turn_right
+        self._lower_set_angle = robot.lower_arm.set_angle
+        self._hand_grab = robot.hand.grab
+        self._hand_release = robot.hand.release
 
     # -- movement -------------------------------------------------------
 
     def turn_left(self, angle: int = 90) -> None:
         """Rotate the arm to the left by *angle* degrees."""
-        self._log(f"arm.turn_left({angle})")
-        self._robot.upper_arm.turn_left(angle)
+        if self._log_enabled:
+            self._log(f"arm.turn_left({angle})")
+        self._upper_turn_left(angle)
 
     def turn_right(self, angle: int = 90) -> None:
         """Rotate the arm to the right by *angle* degrees."""
-        self._log(f"arm.turn_right({angle})")
-        self._robot.upper_arm.turn_right(angle)
+        if self._log_enabled:
+            self._log(f"arm.turn_right({angle})")
+        self._upper_turn_right(angle)
 
     def set_yaw(self, angle: int) -> None:
         """Set the arm to an absolute angle (0-180)."""
-        self._log(f"arm.set_yaw({angle})")
-        self._robot.upper_arm.set_angle(angle)
+        if self._log_enabled:
+            self._log(f"arm.set_yaw({angle})")
+        self._upper_set_angle(angle)
 
     # -- gripper --------------------------------------------------------
 
     def grab(self) -> None:
         """Close the gripper."""
-        self._log("arm.grab()")
-        self._robot.hand.grab()
+        if self._log_enabled:
+            self._log("arm.grab()")
+        self._hand_grab()
 
     def release(self) -> None:
         """Open the gripper."""
-        self._log("arm.release()")
-        self._robot.hand.release()
+        if self._log_enabled:
+            self._log("arm.release()")
+        self._hand_release()
 
     # -- elbow ----------------------------------------------------------
 
     def lift_up(self, angle: int = 90) -> None:
         """Rotate the lower arm (elbow) to the left by *angle* degrees."""
-        self._log(f"arm.lift_up({angle})")
-        self._robot.lower_arm.turn_left(angle)
+        if self._log_enabled:
+            self._log(f"arm.lift_up({angle})")
+        self._lower_turn_left(angle)
 
     def lower_down(self, angle: int = 90) -> None:
         """Rotate the lower arm (elbow) to the right by *angle* degrees."""
-        self._log(f"arm.lower_down({angle})")
-        self._robot.lower_arm.turn_right(angle)
+        if self._log_enabled:
+            self._log(f"arm.lower_down({angle})")
+        self._lower_turn_right(angle)
         
     def set_pitch(self, angle: int) -> None:
         """Set the arm elbow to absolute angle (0-180)"""
-        self._log(f"arm.set_pitch({angle})")
-        self._robot.lower_arm.set_angle(angle)
+        if self._log_enabled:
+            self._log(f"arm.set_pitch({angle})")
+        self._lower_set_angle(angle)
 
     # -- timing ---------------------------------------------------------
 
     def delay(self, seconds: float) -> None:
         """Pause execution for *seconds* (can be fractional, e.g. 0.5)."""
-        self._log(f"arm.delay({seconds})")
-        time.sleep(float(seconds))
+        duration = float(seconds)  # still validates the argument
+        if duration <= 0.0:
+            return
+        if self._log_enabled:
+            self._log(f"arm.delay({seconds})")
+        self._flush()
+        self._sleep(duration)
 
 
 # ---------------------------------------------------------------------------
@@ -2,13 +2,229 @@
 
 from __future__ import annotations
 
+import ast
+import ctypes
 import io
-import traceback
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from types import CodeType
 from typing import Any, Callable
 
 from neo_robot.engine.apis import SAFE_BUILTINS, StudentArmAPI
 from neo_robot.engine.execution_result import ExecutionResult
 
+logger = logging.getLogger(__name__)
+
+# Live log lines are coalesced and handed to the callback in batches: once
+# this many lines are pending, or once the oldest pending line has waited
+# this many seconds, whichever comes first.
+_LOG_FLUSH_LINES = 32
+_LOG_FLUSH_INTERVAL = 0.02
+# Most lines that may wait for the callback; the student thread blocks
+# until there is room, so a print loop cannot outrun the UI.
+_LOG_BUFFER_LINES = 1024
+
+# Seconds between attempts to raise a pending interrupt: it is only raised
+# while the running thread is in student code, and again until it finishes.
+_INTERRUPT_RETRY = 0.01
+# ``delay`` sleeps in slices of at most this many seconds, checking for an
+# interrupt between them.
+_SLEEP_SLICE = 0.05
+# Upper bound on how long a finished run waits for its log lines to be
+# delivered; a stuck callback must not hang the next run.
+_LOG_FINISH_TIMEOUT = 1.0
+
+
+class _SandboxChecker(ast.NodeVisitor):
+    """Reject constructs the builtins whitelist alone cannot block.
+
+    ``import`` is a statement rather than a builtin, and dunder names such
+    as ``__builtins__`` or ``().__class__`` lead straight out of the
+    sandbox.  Violations are raised as :class:`SyntaxError` so they reach
+    the student through the same handler as ordinary syntax mistakes.
+    """
+
+    def _reject(self, node: ast.AST, msg: str) -> None:
+        raise SyntaxError(msg, ("<student>", node.lineno, node.col_offset + 1, None))
+
+    def visit_Import(self, node: ast.Import) -> None:
+        self._reject(node, "Không được phép dùng lệnh import")
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        self._reject(node, "Không được phép dùng lệnh import")
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if node.attr.startswith("__"):
+            self._reject(node, f"Không được phép truy cập '{node.attr}'")
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if node.id.startswith("__"):
+            self._reject(node, f"Không được phép truy cập '{node.id}'")
+
+    def visit_MatchClass(self, node: ast.MatchClass) -> None:
+        # ``case int(__class__=c)`` reads the attribute without an
+        # ``ast.Attribute`` node.
+        for attr in node.kwd_attrs:
+            if attr.startswith("__"):
+                self._reject(node, f"Không được phép truy cập '{attr}'")
+        self.generic_visit(node)
+
+
+def _strip_docstrings(tree: ast.Module) -> None:
+    """Remove module, class and function docstrings from *tree* in place.
+
+    Docstrings are unreachable from the sandbox (dunder access is rejected),
+    so dropping them only shrinks the compiled code.  This is done on the
+    AST rather than with ``compile(..., optimize=2)``, which would also
+    strip ``assert`` statements that students rely on.
+    """
+    for node in ast.walk(tree):
+        if not isinstance(
+            node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+        ):
+            continue
+        body = node.body
+        if (
+            body
+            and isinstance(body[0], ast.Expr)
+            and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)
+        ):
+            if len(body) > 1:
+                del body[0]
+            else:
+                body[0] = ast.copy_location(ast.Pass(), body[0])
+
+
+@lru_cache(maxsize=32)
+def _parse_student(code: str) -> ast.Module:
+    """Parse and validate student *code*, memoised by source text.
+
+    ``SyntaxError`` (including sandbox violations) propagates and is not
+    cached.
+    """
+    tree = ast.parse(code, "<student>")
+    _SandboxChecker().visit(tree)
+    _strip_docstrings(tree)
+    return tree
+
+
+@lru_cache(maxsize=32)
+def _compile_student(code: str) -> CodeType:
+    """Compile student *code*, memoised so unchanged re-runs skip the compiler.
+
+    ``SyntaxError`` propagates and is not cached.
+    """
+    return compile(_parse_student(code), "<student>", "exec")
+
+
+@lru_cache(maxsize=32)
+def _uses_print(code: str) -> bool:
+    """Return whether student *code* refers to ``print`` anywhere.
+
+    Because dunder access is rejected, a program without a ``print`` name
+    has no way to reach it.  Only called after :func:`_compile_student`
+    succeeded, so the parse is a cache hit.
+    """
+    tree = _parse_student(code)
+    return any(
+        isinstance(node, ast.Name) and node.id == "print" for node in ast.walk(tree)
+    )
+
+
+class _ExecutionInterrupted(BaseException):
+    """Aborts student code; its :attr:`message` is shown to the student.
+
+    Derives from :class:`BaseException` so that ordinary exception handling
+    in the student's program does not swallow it.
+    """
+
+    message = ""
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class _AsyncInterrupt(_ExecutionInterrupted):
+    """Raised asynchronously in the executing thread by the watchdog.
+
+    A bare ``except:`` still catches it, so creating one (which happens in
+    the target thread) also traps the student's frames: from then on every
+    line of student code, the handler's own lines included, raises it
+    again until the exception escapes the program.
+    """
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        _trap_student_frames(type(self))
+
+
+class _ExecutionTimeout(_AsyncInterrupt):
+    message = "Chương trình chạy quá thời gian cho phép"
+
+
+class _ExecutionStopped(_AsyncInterrupt):
+    message = "Đã dừng thực thi"
+
+
+class _ExecutorBusy(_ExecutionInterrupted):
+    message = "Chương trình trước vẫn đang dừng, hãy thử lại"
+
+
+# PyThreadState_SetAsyncExc(ident, exc): raises *exc* in the thread at its
+# next bytecode check; a NULL *exc* cancels a pending one.
+_set_async_exc = ctypes.pythonapi.PyThreadState_SetAsyncExc
+
+# The thread ident and interrupt the trap re-raises, per thread.
+_trap_state = threading.local()
+
+
+def _interrupt_trace(frame: Any, event: str, arg: Any) -> Any:
+    """Trace function that re-raises the pending interrupt in student frames.
+
+    It schedules the exception rather than raising it: CPython switches
+    tracing off for good when a trace function raises.
+    """
+    if frame.f_code.co_filename != "<student>":
+        return None
+    if event == "line" or event == "call":
+        _set_async_exc(_trap_state.ident, _trap_state.exc)
+    return _interrupt_trace
+
+
+def _trap_student_frames(exc_type: type[_AsyncInterrupt]) -> None:
+    """Make the student frames on the current thread raise *exc_type*."""
+    _trap_state.ident = ctypes.c_ulong(threading.get_ident())
+    _trap_state.exc = ctypes.py_object(exc_type)
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code.co_filename == "<student>":
+            frame.f_trace = _interrupt_trace
+        frame = frame.f_back
+    sys.settrace(_interrupt_trace)
+
+
+class _Run:
+    """One :meth:`CodeExecutor._exec` call, as seen by the watchdog."""
+
+    __slots__ = ("ident", "deadline", "interrupt")
+
+    def __init__(self, ident: int, deadline: float | None) -> None:
+        self.ident = ctypes.c_ulong(ident)
+        self.deadline = deadline
+        # Set once the run must stop; the watchdog keeps raising it.
+        self.interrupt: type[_AsyncInterrupt] | None = None
+
+
+def _captured(output_buf: io.StringIO | None) -> str:
+    """Return the text captured in *output_buf* (``""`` if none)."""
+    return output_buf.getvalue() if output_buf is not None else ""
+
 
 class CodeExecutor:
     """Execute student Python code in a restricted sandbox.
@@ -17,110 +233,402 @@ class CodeExecutor:
     * Injects an ``arm`` object (:class:`StudentArmAPI`) into the namespace.
     * Replaces ``print()`` with a version that captures to a buffer.
     * Strips ``__builtins__`` down to a safe whitelist.
+    * Rejects ``import`` statements and dunder names before compiling.
     * Catches all exceptions and returns friendly error messages.
+    * Aborts programs that run longer than *timeout* seconds, or when
+      :meth:`interrupt` is called (e.g. from the UI's Stop action).
     """
 
-    def __init__(self, robot: Any) -> None:
+    def __init__(self, robot: Any, timeout: float | None = None) -> None:
         self._robot = robot
+        self._timeout = timeout
+        # The run currently executing student code, guarded by ``_run_lock``
+        # so an interrupt never targets a finished run.  This is a plain
+        # C-level lock on purpose: a late interrupt cannot land inside its
+        # acquire or release and leave it held.
+        self._run_lock = threading.Lock()
+        self._run: _Run | None = None
+        self._watchdog: threading.Thread | None = None
+        self._watchdog_wake = threading.Event()
         self._log_callback: Callable[[str], None] | None = None
+        # Pending lines, filled by the student thread and handed to the
+        # callback by a background thread, so that a slow callback (e.g. a
+        # UI repaint) does not stall the program until the buffer is full.
+        # Everything below is guarded by ``_log_lock``.
+        self._log_buf: deque[str] = deque()
+        self._log_lock = threading.Lock()
+        self._log_cond = threading.Condition(self._log_lock)
+        # Set when the pending lines should go out without waiting for
+        # the flush interval.
+        self._log_flush_due = False
+        # True while the log thread is inside the callback.
+        self._log_busy = False
+        self._log_thread: threading.Thread | None = None
+        # Builtins shared by every batch run.  Only the ``print`` slot
+        # changes between runs, so no per-run copy is needed; student code
+        # cannot reach ``__builtins__`` to mutate it.
+        self._batch_builtins: dict[str, Any] = SAFE_BUILTINS.copy()
         # Persistent namespace for interactive (REPL) mode.
         # Lazily initialised by the first call to ``execute_line``.
         self._interactive_ns: dict[str, Any] | None = None
+        # Output buffer reused by every ``execute_line`` call; the REPL's
+        # ``print`` is bound to it once when the namespace is created.
+        self._repl_buf = io.StringIO()
+        self._repl_print: Callable[..., None] | None = None
 
     def set_log_callback(self, callback: Callable[[str], None]) -> None:
-        """Set a callback that receives real-time log lines."""
+        """Set a callback that receives real-time log lines.
+
+        The callback is invoked from a dedicated background thread with one
+        or more newline-joined lines per call.
+        """
         self._log_callback = callback
 
+    # -- live log buffering ---------------------------------------------
+
+    def _buffered_log(self, msg: str) -> None:
+        """Queue *msg* for the log callback, waking the log thread if due.
+
+        Dropped while no callback is set.  Blocks while the buffer is full,
+        raising the run's interrupt if it is stopped meanwhile.
+        """
+        if self._log_callback is None:
+            return
+        buf = self._log_buf
+        with self._log_lock:
+            while len(buf) >= _LOG_BUFFER_LINES:
+                run = self._run
+                if run is not None and run.interrupt is not None:
+                    raise run.interrupt
+                self._log_cond.wait(_SLEEP_SLICE)
+            buf.append(msg)
+            # Wake the log thread for the first pending line, so it starts
+            # the flush timer, and again once a full batch is pending.
+            pending = len(buf)
+            if pending == 1:
+                self._start_log_thread()
+                self._log_cond.notify_all()
+            elif pending == _LOG_FLUSH_LINES:
+                self._log_cond.notify_all()
+
+    def _flush_logs(self) -> None:
+        """Have the log thread deliver all pending lines without delay."""
+        with self._log_lock:
+            if self._log_buf:
+                self._log_flush_due = True
+                self._log_cond.notify_all()
+
+    def _start_log_thread(self) -> None:
+        if self._log_thread is None:
+            self._log_thread = threading.Thread(
+                target=self._log_worker, name="neo-robot-log", daemon=True
+            )
+            self._log_thread.start()
+
+    def _log_worker(self) -> None:
+        """Forward pending lines to the callback (runs on its own thread).
+
+        After the first pending line it waits up to
+        :data:`_LOG_FLUSH_INTERVAL` for more, unless a full batch or a
+        flush arrives first, then delivers them all as one message.
+        """
+        buf = self._log_buf
+        cond = self._log_cond
+        while True:
+            with cond:
+                self._log_busy = False
+                while not buf:
+                    cond.notify_all()
+                    cond.wait()
+                if len(buf) < _LOG_FLUSH_LINES and not self._log_flush_due:
+                    cond.wait(_LOG_FLUSH_INTERVAL)
+                batch = "\n".join(buf)
+                buf.clear()
+                self._log_flush_due = False
+                self._log_busy = True
+                # Let a student thread blocked on a full buffer continue.
+                cond.notify_all()
+            callback = self._log_callback
+            try:
+                if callback is not None:
+                    callback(batch)
+            except Exception:
+                # Keep the thread alive for later lines; a dead log thread
+                # would leave the student thread blocked on a full buffer.
+                logger.exception("Live log callback failed")
+
+    def _finish_logs(self) -> None:
+        """Flush pending lines and wait until the callback has received them.
+
+        Gives up after :data:`_LOG_FINISH_TIMEOUT` seconds.
+        """
+        buf = self._log_buf
+        cond = self._log_cond
+        deadline = time.monotonic() + _LOG_FINISH_TIMEOUT
+        with cond:
+            if buf:
+                self._log_flush_due = True
+                cond.notify_all()
+            while buf or self._log_busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                cond.wait(remaining)
+
+    def _live_log(self) -> Callable[[str], None] | None:
+        """Return the buffered logger, or ``None`` if no callback is set."""
+        return self._buffered_log if self._log_callback else None
+
+    # -- interruption ---------------------------------------------------
+
+    def interrupt(self) -> None:
+        """Abort the student code currently running, if any.
+
+        Safe to call from any thread.  The running :meth:`execute` or
+        :meth:`execute_line` returns a failed result shortly afterwards.
+        """
+        with self._run_lock:
+            run = self._run
+            if run is not None and run.interrupt is None:
+                run.interrupt = _ExecutionStopped
+        self._watchdog_wake.set()
+        # A student thread waiting for room in the log buffer raises it.
+        with self._log_lock:
+            self._log_cond.notify_all()
+
+    def _watch(self) -> None:
+        """Enforce timeouts and interrupts (runs on its own thread).
+
+        Once a run is interrupted, the exception is raised every
+        :data:`_INTERRUPT_RETRY` seconds until that run has finished, but
+        only while the thread's innermost frame is student code.  Raised
+        anywhere else it could land inside the log plumbing or a robot
+        driver and leave a lock or queue half updated.  The frame check
+        and the raise run back to back, well inside the GIL switch
+        interval, so the thread cannot move on in between; once it
+        resumes, the exception fires in that same frame.
+        """
+        wake = self._watchdog_wake
+        while True:
+            timeout: float | None = None
+            with self._run_lock:
+                run = self._run
+                if run is not None:
+                    now = time.monotonic()
+                    if (
+                        run.interrupt is None
+                        and run.deadline is not None
+                        and now >= run.deadline
+                    ):
+                        run.interrupt = _ExecutionTimeout
+                    if run.interrupt is not None:
+                        exc = ctypes.py_object(run.interrupt)
+                        frame = sys._current_frames().get(run.ident.value)
+                        if frame is not None and frame.f_code.co_filename == "<student>":
+                            _set_async_exc(run.ident, exc)
+                        timeout = _INTERRUPT_RETRY
+                    elif run.deadline is not None:
+                        timeout = run.deadline - now
+            wake.wait(timeout)
+            wake.clear()
+
+    def _exec(
+        self,
+        code_obj: CodeType,
+        namespace: dict[str, Any],
+        print_fn: Callable[..., None] | None,
+        on_start: Callable[[], None] | None = None,
+    ) -> None:
+        """Run *code_obj* in *namespace* under the watchdog.
+
+        *print_fn* becomes the namespace's ``print`` (``None`` removes it)
+        and *on_start* is called once the run is accepted, so a refused run
+        never redirects the output of the one still running.  Raises
+        :class:`_ExecutorBusy` if an earlier run has not finished yet, e.g.
+        one that is still unwinding after Stop.
+        """
+        deadline = (
+            time.monotonic() + self._timeout if self._timeout is not None else None
+        )
+        run = _Run(threading.get_ident(), deadline)
+        with self._run_lock:
+            if self._run is not None:
+                raise _ExecutorBusy
+            self._run = run
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(
+                    target=self._watch, name="neo-robot-watchdog", daemon=True
+                )
+                self._watchdog.start()
+        self._watchdog_wake.set()
+        try:
+            if print_fn is not None:
+                namespace["__builtins__"]["print"] = print_fn
+            else:
+                namespace["__builtins__"].pop("print", None)
+            if on_start is not None:
+                on_start()
+            exec(code_obj, namespace)  # noqa: S102
+        finally:
+            # Kept inline and free of Python-level calls: a late interrupt
+            # cannot cut it short, and CPython 3.11 stalls on the next
+            # Python call if the trap's trace function is still installed.
+            # Only the owning run releases the slot.
+            with self._run_lock:
+                if self._run is run:
+                    self._run = None
+                _set_async_exc(run.ident, None)
+            if sys.gettrace() is _interrupt_trace:
+                sys.settrace(None)
+
+    def _sleep(self, seconds: float) -> None:
+        """Sleep on the running thread, raising the run's interrupt if set.
+
+        ``delay`` is not student code, so the watchdog never raises into
+        it; this checks for the interrupt itself between slices.
+        """
+        run = self._run
+        deadline = time.monotonic() + seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            if run is not None and run.interrupt is not None:
+                raise run.interrupt
+            time.sleep(min(remaining, _SLEEP_SLICE))
+
     # -- helpers --------------------------------------------------------
 
     def _make_print(self, output_buf: io.StringIO) -> Callable[..., None]:
         """Build a sandboxed ``print`` that captures to *output_buf*."""
+        buffered_log = self._buffered_log
 
-        def _print(*args: Any, **kwargs: Any) -> None:
-            kwargs.pop("file", None)
-            print(*args, **kwargs, file=output_buf)
-            line = io.StringIO()
-            print(*args, **kwargs, file=line)
+        def _print(
+            *args: Any,
+            sep: str | None = " ",
+            end: str | None = "\n",
+            file: Any = None,
+            flush: bool = False,
+        ) -> None:
+            # Render once; the same text goes to the buffer and the live log.
+            text = (" " if sep is None else sep).join(map(str, args))
+            text += "\n" if end is None else end
+            output_buf.write(text)
             if self._log_callback:
-                self._log_callback(line.getvalue().rstrip("\n"))
+                buffered_log(text.rstrip("\n"))
 
         return _print
 
-    def _make_namespace(self, output_buf: io.StringIO) -> dict[str, Any]:
-        """Build a restricted namespace containing the student API."""
-        arm_api = StudentArmAPI(self._robot, log=self._log_callback)
+    def _make_namespace(
+        self,
+        builtins: dict[str, Any],
+        log: Callable[[str], None] | None,
+    ) -> dict[str, Any]:
+        """Build a restricted namespace containing the student API.
+
+        ``print`` is installed into *builtins* by :meth:`_exec`.
+        """
+        arm_api = StudentArmAPI(
+            self._robot, log=log, flush=self._flush_logs, sleep=self._sleep
+        )
 
         def _delay(seconds: float) -> None:
             arm_api.delay(seconds)
 
+        # *builtins* must be an exact dict: CPython only takes its fast
+        # builtin lookup path for those.
         return {
-            "__builtins__": {**SAFE_BUILTINS, "print": self._make_print(output_buf)},
+            "__builtins__": builtins,
             "arm": arm_api,
             "delay": _delay,
         }
 
     @staticmethod
-    def _extract_error(exc: Exception) -> str:
+    def _extract_error(exc: BaseException) -> str:
         """Return a student-friendly error string with line info."""
-        tb_lines = traceback.format_exception(type(exc), exc, exc.__traceback__)
+        # Report the innermost frame that belongs to the student's code.
         line_num = ""
-        for tb_line in tb_lines:
-            if "<student>" in tb_line:
-                parts = tb_line.strip().split(", ")
-                for part in parts:
-                    if part.startswith("line "):
-                        line_num = f" ({part})"
-                        break
+        tb = exc.__traceback__
+        while tb is not None:
+            if tb.tb_frame.f_code.co_filename == "<student>":
+                line_num = f" (line {tb.tb_lineno})"
+            tb = tb.tb_next
         return f"Error{line_num}: {exc}"
 
     # -- batch mode (script editor) -------------------------------------
 
-    def execute(self, code: str) -> ExecutionResult:
-        """Run *code* in a fresh namespace and return an :class:`ExecutionResult`."""
-        output_buf = io.StringIO()
-        namespace = self._make_namespace(output_buf)
+    def execute(
+        self, code: str, on_start: Callable[[], None] | None = None
+    ) -> ExecutionResult:
+        """Run *code* in a fresh namespace and return an :class:`ExecutionResult`.
 
+        *on_start*, if given, is called on the executing thread right before
+        the code starts, i.e. only if it is not refused as busy.
+        """
+        # Compile first: a syntax error is then parsed exactly once.
         try:
-            exec(compile(code, "<student>", "exec"), namespace)  # noqa: S102
-            return ExecutionResult(
-                output=output_buf.getvalue(),
-                success=True,
-            )
+            code_obj = _compile_student(code)
         except SyntaxError as exc:
             line_info = f" (line {exc.lineno})" if exc.lineno else ""
             return ExecutionResult(
-                output=output_buf.getvalue(),
+                output="",
                 error=f"Syntax Error{line_info}: {exc.msg}",
                 success=False,
             )
-        except Exception as exc:  # noqa: BLE001
+
+        # Programs that never mention print need no capture buffer at all.
+        if _uses_print(code):
+            output_buf = io.StringIO()
+            print_fn = self._make_print(output_buf)
+        else:
+            output_buf = print_fn = None
+        namespace = self._make_namespace(self._batch_builtins, self._live_log())
+
+        try:
+            self._exec(code_obj, namespace, print_fn, on_start)
             return ExecutionResult(
-                output=output_buf.getvalue(),
+                output=_captured(output_buf),
+                success=True,
+            )
+        except (Exception, _ExecutionInterrupted) as exc:  # noqa: BLE001
+            return ExecutionResult(
+                output=_captured(output_buf),
                 error=self._extract_error(exc),
                 success=False,
             )
+        finally:
+            self._finish_logs()
 
     # -- interactive mode (REPL) ----------------------------------------
 
-    def execute_line(self, line: str) -> ExecutionResult:
+    def execute_line(
+        self, line: str, on_start: Callable[[], None] | None = None
+    ) -> ExecutionResult:
         """Execute a single *line* in a persistent namespace.
 
         Unlike :meth:`execute`, the namespace is kept between calls so
         that variables defined in one command are available in the next,
-        behaving like a Python REPL session.
+        behaving like a Python REPL session.  *on_start* is as for
+        :meth:`execute`.
         """
-        output_buf = io.StringIO()
+        output_buf = self._repl_buf
+        output_buf.seek(0)
+        output_buf.truncate(0)
 
-        # Lazily create the persistent namespace on first use
+        # Lazily create the persistent namespace on first use; its print
+        # keeps writing to the same (now emptied) buffer on later calls.
         if self._interactive_ns is None:
-            self._interactive_ns = self._make_namespace(output_buf)
-        else:
-            # Swap in a fresh print that writes to this call's buffer
-            builtins = self._interactive_ns["__builtins__"]
-            builtins["print"] = self._make_print(output_buf)
+            # The namespace outlives this call, so its arm logger must check
+            # for a callback per line rather than once here.
+            self._interactive_ns = self._make_namespace(
+                SAFE_BUILTINS.copy(), self._buffered_log
+            )
+            self._repl_print = self._make_print(output_buf)
 
         try:
-            exec(compile(line, "<student>", "exec"), self._interactive_ns)  # noqa: S102
+            self._exec(
+                _compile_student(line),
+                self._interactive_ns,
+                self._repl_print,
+                on_start,
+            )
             return ExecutionResult(
                 output=output_buf.getvalue(),
                 success=True,
@@ -131,12 +639,20 @@ class CodeExecutor:
                 error=f"Syntax Error: {exc.msg}",
                 success=False,
             )
+        except _ExecutionInterrupted as exc:
+            return ExecutionResult(
+                output=output_buf.getvalue(),
+                error=str(exc),
+                success=False,
+            )
         except Exception as exc:  # noqa: BLE001
             return ExecutionResult(
                 output=output_buf.getvalue(),
                 error=f"{type(exc).__name__}: {exc}",
                 success=False,
             )
+        finally:
+            self._finish_logs()
 
     def reset_session(self) -> None:
         """Discard the interactive namespace so the next call starts fresh."""
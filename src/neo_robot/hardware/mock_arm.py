@@ -17,12 +17,22 @@ def _noop(msg: str) -> None:  # pragma: no cover
     """Default no-op logger used when no callback is provided."""
 
 
+# Fixed gripper messages, built once at import time.
+_GRAB_MSG = "[hand] grab()"
+_RELEASE_MSG = "[hand] release()"
+
+
 class MockArm:
     """Simulated single servo joint that logs movements."""
 
     def __init__(self, name: str = "arm", log: LogCallback = _noop) -> None:
         self.name = name
         self._log = log
+        self._log_enabled = log is not _noop
+        # Constant message prefixes, so each move only formats the angles.
+        self._turn_left_prefix = f"[{name}] turn_left("
+        self._turn_right_prefix = f"[{name}] turn_right("
+        self._set_angle_prefix = f"[{name}] set_angle("
         self._current_angle: int = 0
 
     def turn_left(self, angle: int) -> None:
@@ -31,7 +41,8 @@ class MockArm:
         if self._current_angle - angle < 0:
             raise ValueError(f"Chỉ có thể xoay trái {self._current_angle} độ")
         new_angle = max(0, self._current_angle - int(angle))
-        self._log(f"[{self.name}] turn_left({angle}) -> {new_angle} deg")
+        if self._log_enabled:
+            self._log(f"{self._turn_left_prefix}{angle}) -> {new_angle} deg")
         self._current_angle = new_angle
 
     def turn_right(self, angle: int) -> None:
@@ -40,17 +51,20 @@ class MockArm:
         if self._current_angle + angle > 180:
             raise ValueError(f"Chỉ có thể xoay phải {180 - self._current_angle} độ")
         new_angle = min(180, self._current_angle + int(angle))
-        self._log(f"[{self.name}] turn_right({angle}) -> {new_angle} deg")
+        if self._log_enabled:
+            self._log(f"{self._turn_right_prefix}{angle}) -> {new_angle} deg")
         self._current_angle = new_angle
 
     def set_angle(self, angle: int) -> None:
         if (angle < 0) or (angle > 180):
             raise ValueError("Góc phải nằm trong khoảng 0 đến 180")
         if self._current_angle == angle:
-            self._log(f"[{self.name}] set_angle({angle}) -> already at {angle} deg")
+            if self._log_enabled:
+                self._log(f"{self._set_angle_prefix}{angle}) -> already at {angle} deg")
             return
         clamped = max(0, min(180, int(angle)))
-        self._log(f"[{self.name}] set_angle({angle}) -> {clamped} deg")
+        if self._log_enabled:
+            self._log(f"{self._set_angle_prefix}{angle}) -> {clamped} deg")
         self._current_angle = clamped
 
     @property
@@ -66,12 +80,14 @@ class MockHand(MockArm):
         self._grabbed = False
 
     def grab(self) -> None:
-        self._log("[hand] grab()")
+        if self._log_enabled:
+            self._log(_GRAB_MSG)
         self.set_angle(60)
         self._grabbed = True
 
     def release(self) -> None:
-        self._log("[hand] release()")
+        if self._log_enabled:
+            self._log(_RELEASE_MSG)
         self.set_angle(0)
         self._grabbed = False
 
@@ -58,7 +58,7 @@ class NeoRobotApp(App):
                 )
                 self._robot = MockRobotArm()
 
-        self._executor = CodeExecutor(self._robot)
+        self._executor = CodeExecutor(self._robot, timeout=self.config.run_timeout)
         self.push_screen(MainScreen(self._executor))
 
     def on_unmount(self) -> None:
@@ -8,6 +8,7 @@ from textual.binding import Binding
 from textual.containers import Horizontal, Vertical
 from textual.screen import Screen
 from textual.widgets import Footer, Header, Static
+from textual.worker import get_current_worker
 
 from neo_robot.engine import CodeExecutor, ExecutionResult
 from neo_robot.ui.widgets.code_editor import CodeEditor
@@ -69,7 +70,8 @@ class MainScreen(Screen):
         super().__init__(**kwargs)
         self._executor = executor
         self._interactive_mode = False
-        self._running = False
+        # Created on the first switch to interactive mode
+        self._repl: InteractiveConsole | None = None
 
     # -- layout ---------------------------------------------------------
 
@@ -83,30 +85,51 @@ class MainScreen(Screen):
             with Vertical(id="console-pane"):
                 yield Static("Bảng điều khiển", classes="pane-title")
                 yield ConsoleOutput(id="console")
-        # Interactive mode pane (hidden by default via CSS)
-        with Vertical(id="interactive-pane"):
+        # Interactive mode pane, hidden until the first toggle; the
+        # InteractiveConsole itself is mounted lazily by action_toggle_mode
+        with Vertical(id="interactive-pane") as interactive_pane:
+            interactive_pane.display = False
             yield Static("Bảng lệnh tương tác", classes="pane-title")
-            yield InteractiveConsole(id="interactive")
         yield Footer()
 
+    def on_mount(self) -> None:
+        """Look up the widgets used by the actions once, after compose."""
+        self._main_split = self.query_one("#main-split")
+        self._interactive_pane = self.query_one("#interactive-pane")
+        self._editor = self.query_one("#editor", CodeEditor)
+        self._console_output = self.query_one("#console", ConsoleOutput)
+        # Console that receives the live log of the run in progress; set by
+        # each worker once the executor accepts its run, so toggling modes
+        # mid-run does not split one run's output across both panes, and a
+        # run refused as busy does not take over the live log of the one
+        # still unwinding.
+        self._log_target: ConsoleOutput | InteractiveConsole = self._console_output
+        self._executor.set_log_callback(self._forward_log)
+
+    def _forward_log(self, msg: str) -> None:
+        """Forward live log lines to the console of the current run.
+
+        Called from the executor's log thread; ``write_status`` only queues.
+        """
+        self._log_target.write_status(msg)
+
     # -- mode toggle ----------------------------------------------------
 
-    def action_toggle_mode(self) -> None:
+    async def action_toggle_mode(self) -> None:
         """Switch between script and interactive mode."""
         self._interactive_mode = not self._interactive_mode
 
-        main_split = self.query_one("#main-split")
-        interactive_pane = self.query_one("#interactive-pane")
-
         if self._interactive_mode:
-            main_split.display = False
-            interactive_pane.display = True
+            if self._repl is None:
+                self._repl = InteractiveConsole(id="interactive")
+                await self._interactive_pane.mount(self._repl)
+            self._main_split.display = False
+            self._interactive_pane.display = True
             # Focus the REPL input
-            repl: InteractiveConsole = self.query_one("#interactive", InteractiveConsole)
-            repl.focus_input()
+            self._repl.focus_input()
         else:
-            main_split.display = True
-            interactive_pane.display = False
+            self._main_split.display = True
+            self._interactive_pane.display = False
 
         # Refresh the footer so check_action hides/shows mode-specific bindings
         self.refresh_bindings()
@@ -115,6 +138,11 @@ class MainScreen(Screen):
 
     def on_command_submitted(self, event: CommandSubmitted) -> None:
         """Handle a command submitted from the interactive console."""
+        # A new exclusive worker would cancel the running one and take
+        # over its output, so wait until it has finished.
+        if any(not worker.is_finished for worker in self.workers):
+            self._repl.write_error("Đang có chương trình chạy, nhấn Ctrl+X để dừng.")
+            return
         self._run_interactive_command(event.command)
 
     # -- actions --------------------------------------------------------
@@ -123,46 +151,41 @@ class MainScreen(Screen):
         """Get the code from the editor and execute it (script mode only)."""
         if self._interactive_mode:
             return
+        # The worker registry is the only record of a run in progress;
+        # a worker still pending counts, so a fast double F5 runs once
+        if any(not worker.is_finished for worker in self.workers):
+            return
 
-        editor: CodeEditor = self.query_one("#editor", CodeEditor)
-        console: ConsoleOutput = self.query_one("#console", ConsoleOutput)
-        code = editor.get_code()
+        code = self._editor.get_code()
 
-        if not code.strip():
-            console.write_error("Không có mã để chạy.")
+        if not code or code.isspace():
+            self._console_output.write_error("Không có mã để chạy.")
             return
 
-        self._running = True
-        console.write_status("Đang chạy mã...")
+        self._console_output.write_status("Đang chạy mã...")
         self._run_code_in_worker(code)
 
     def action_stop_code(self) -> None:
-        """Cancel any running worker."""
+        """Cancel any running worker and abort the student code it runs."""
         self.workers.cancel_all()
+        self._executor.interrupt()
         if self._interactive_mode:
-            repl: InteractiveConsole = self.query_one("#interactive", InteractiveConsole)
-            repl.write_error("Đã dừng thực thi theo yêu cầu người dùng.")
+            self._repl.write_error("Đã dừng thực thi theo yêu cầu người dùng.")
         else:
-            console: ConsoleOutput = self.query_one("#console", ConsoleOutput)
-            console.write_error("Đã dừng thực thi theo yêu cầu người dùng.")
-        self._running = False
+            self._console_output.write_error("Đã dừng thực thi theo yêu cầu người dùng.")
 
     def action_clear_console(self) -> None:
         """Clear the console output (or the REPL log in interactive mode)."""
         if self._interactive_mode:
-            from textual.widgets import RichLog
-            log = self.query_one("#interactive #repl-log", RichLog)
-            log.clear()
+            self._repl.clear_log()
         else:
-            console: ConsoleOutput = self.query_one("#console", ConsoleOutput)
-            console.clear_console()
+            self._console_output.clear_console()
 
     def action_clear_editor(self) -> None:
         """Clear the code editor (script mode only)."""
         if self._interactive_mode:
             return
-        editor: CodeEditor = self.query_one("#editor", CodeEditor)
-        editor.set_code("")
+        self._editor.set_code("")
 
     # -- worker (script mode) -------------------------------------------
 
@@ -170,48 +193,52 @@ class MainScreen(Screen):
     def _run_code_in_worker(self, code: str) -> None:
         """Execute student code on a background thread.
 
-        Uses ``call_from_thread`` to safely update UI widgets from
-        the worker thread.
+        The console's ``write_*`` helpers only queue text for its UI-side
+        flush timer, so they are called directly from the worker thread
+        instead of hopping to the UI thread with ``call_from_thread``.
         """
-        console: ConsoleOutput = self.query_one("#console", ConsoleOutput)
+        console = self._console_output
 
-        def _live_log(msg: str) -> None:
-            """Forward log lines to the console in real time."""
-            self.app.call_from_thread(console.write_status, msg)
+        def route_log() -> None:
+            self._log_target = console
 
-        self._executor.set_log_callback(_live_log)
+        result: ExecutionResult = self._executor.execute(code, on_start=route_log)
 
-        result: ExecutionResult = self._executor.execute(code)
+        # Stopped by the user: action_stop_code has already reported it
+        if get_current_worker().is_cancelled:
+            return
 
-        # Post results back to the UI thread
-        if result.output.strip():
-            self.app.call_from_thread(console.write_output, result.output.rstrip("\n"))
+        # Queue results for the console's next flush; isspace() stops at
+        # the first visible character, unlike a full strip()
+        output = result.output.rstrip("\n")
+        if output and not output.isspace():
+            console.write_output(output)
 
         if result.success:
-            self.app.call_from_thread(
-                console.write_status, "Thực thi hoàn tất."
-            )
+            console.write_status("Thực thi hoàn tất.")
         else:
-            self.app.call_from_thread(console.write_error, result.error or "Lỗi không xác định")
-
-        self._running = False
+            console.write_error(result.error or "Lỗi không xác định")
 
     # -- worker (interactive mode) --------------------------------------
 
     @work(thread=True, exclusive=True)
     def _run_interactive_command(self, command: str) -> None:
         """Execute a single REPL command on a background thread."""
-        repl: InteractiveConsole = self.query_one("#interactive", InteractiveConsole)
+        repl = self._repl
 
-        def _live_log(msg: str) -> None:
-            self.app.call_from_thread(repl.write_status, msg)
+        def route_log() -> None:
+            self._log_target = repl
 
-        self._executor.set_log_callback(_live_log)
+        result: ExecutionResult = self._executor.execute_line(
+            command, on_start=route_log
+        )
 
-        result: ExecutionResult = self._executor.execute_line(command)
+        if get_current_worker().is_cancelled:
+            return
 
-        if result.output.strip():
-            self.app.call_from_thread(repl.write_output, result.output.rstrip("\n"))
+        output = result.output.rstrip("\n")
+        if output and not output.isspace():
+            repl.write_output(output)
 
         if not result.success:
-            self.app.call_from_thread(repl.write_error, result.error or "Lỗi không xác định")
+            repl.write_error(result.error or "Lỗi không xác định")
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from textual.widgets import TextArea
+from textual.widgets.text_area import DocumentBase, Edit, EditResult
 
 
 _DEFAULT_CODE = """\
@@ -42,12 +43,40 @@ class CodeEditor(TextArea):
             tab_behavior="indent",
             **kwargs,
         )
+        # ``text`` re-joins every document line on each access, so the last
+        # result is kept until the content changes.  Edits bump the counter;
+        # ``load_text`` swaps in a new document object.
+        self._edit_count = 0
+        self._code_cache: tuple[DocumentBase, int, str] | None = None
+
+    # -- change tracking -----------------------------------------------
+
+    def edit(self, edit: Edit) -> EditResult:
+        self._edit_count += 1
+        return super().edit(edit)
+
+    def undo(self) -> None:
+        self._edit_count += 1
+        super().undo()
+
+    def redo(self) -> None:
+        self._edit_count += 1
+        super().redo()
 
     # -- public helpers ------------------------------------------------
 
     def get_code(self) -> str:
         """Return the current editor contents as a string."""
-        return self.text
+        cache = self._code_cache
+        if (
+            cache is not None
+            and cache[0] is self.document
+            and cache[1] == self._edit_count
+        ):
+            return cache[2]
+        code = self.text
+        self._code_cache = (self.document, self._edit_count, code)
+        return code
 
     def set_code(self, code: str) -> None:
         """Replace the editor contents with *code*."""
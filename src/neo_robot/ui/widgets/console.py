@@ -2,15 +2,121 @@
 
 from __future__ import annotations
 
+import threading
+from collections import deque
+from typing import Callable
+
+from rich.style import Style
 from rich.text import Text
 from textual.widgets import RichLog
 
+# Seconds between coalesced writes of pending lines to a RichLog (~60 fps).
+FLUSH_INTERVAL = 0.016
+# Most lines written per flush; rendering a line costs ~50 us, so this
+# keeps each write well inside one frame and leaves time for key presses.
+DRAIN_LINES = 200
+# Writers on other threads wait while this many lines are pending.
+PENDING_LIMIT = 2000
+# Lines kept by the console logs; older ones scroll away for good.
+MAX_LINES = 1000
+
+# Pre-built styles shared by the console widgets, so writes don't re-parse
+# style strings such as "bold red" every time.
+ERROR_STYLE = Style(color="red", bold=True)
+STATUS_STYLE = Style(dim=True, italic=True)
+PROMPT_STYLE = Style(color="green", bold=True)
+HEADER_STYLE = Style(color="cyan", bold=True)
+HINT_STYLE = Style(dim=True)
+
+
+class PendingLines:
+    """Thread-safe queue of styled lines awaiting a single combined write.
+
+    Console widgets append to it from any thread and drain it from a UI
+    timer, so a burst of output costs one :meth:`RichLog.write` per tick
+    instead of one per line.  Lines are kept as plain ``(text, style)``
+    pairs; the only :class:`Text` is the one built by :meth:`drain`.
+
+    Each drain takes at most :data:`DRAIN_LINES` lines.  Writers on any
+    thread but the draining one wait while :data:`PENDING_LIMIT` lines are
+    pending, which slows a runaway print loop down to what the UI can show.
+    Once a drain finds nothing, the queue counts as idle and the next
+    append calls *on_wake*, so the owner can stop its timer in between.
+    """
+
+    def __init__(self, on_wake: Callable[[], None] | None = None) -> None:
+        self._lines: deque[tuple[str, Style | None]] = deque()
+        self._cond = threading.Condition(threading.Lock())
+        # The UI thread, which creates and drains the queue; it must never
+        # wait on itself.
+        self._consumer = threading.get_ident()
+        self._on_wake = on_wake
+        self._idle = False
+        self._closed = False
+
+    def append(self, line: str, style: Style | None = None) -> None:
+        """Queue *line*, drawn in *style*, for the next drain.
+
+        A multi-line *line* is queued line by line.
+        """
+        with self._cond:
+            lines = self._lines
+            if threading.get_ident() != self._consumer:
+                while len(lines) >= PENDING_LIMIT and not self._closed:
+                    self._cond.wait()
+            if "\n" in line:
+                lines.extend((part, style) for part in line.split("\n"))
+            else:
+                lines.append((line, style))
+            wake = self._idle
+            self._idle = False
+        if wake and self._on_wake is not None:
+            self._on_wake()
+
+    def drain(self, limit: int | None = DRAIN_LINES) -> Text | None:
+        """Return up to *limit* queued lines (all if ``None``) as one :class:`Text`.
+
+        Returns ``None``, and marks the queue idle, if nothing is queued.
+        """
+        with self._cond:
+            lines = self._lines
+            if not lines:
+                self._idle = True
+                return None
+            count = len(lines) if limit is None else min(len(lines), limit)
+            batch_lines = [lines.popleft() for _ in range(count)]
+            self._cond.notify_all()
+        batch = Text()
+        append = batch.append
+        line, style = batch_lines[0]
+        append(line, style)
+        for line, style in batch_lines[1:]:
+            append("\n")
+            append(line, style)
+        return batch
+
+    def discard(self) -> None:
+        """Drop every queued line."""
+        with self._cond:
+            self._lines.clear()
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Stop making writers wait, e.g. once the widget is gone."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
 
 class ConsoleOutput(RichLog):
     """Real-time console that displays execution output, errors, and status.
 
     Uses Textual's :class:`~textual.widgets.RichLog` which supports
     Rich renderables and auto-scrolls to the latest entry.
+
+    The ``write_*`` helpers only queue text, which is written out in
+    batches every :data:`FLUSH_INTERVAL` seconds; they are safe to call
+    from worker threads.  The timer is paused while nothing is queued.
     """
 
     def __init__(self, **kwargs) -> None:  # type: ignore[override]
@@ -18,23 +124,44 @@ class ConsoleOutput(RichLog):
             highlight=True,
             markup=True,
             wrap=True,
+            max_lines=MAX_LINES,
             **kwargs,
         )
+        self._pending = PendingLines(on_wake=self._wake)
+
+    def on_mount(self) -> None:
+        self._flush_timer = self.set_interval(FLUSH_INTERVAL, self.flush)
+
+    def on_unmount(self) -> None:
+        self._pending.close()
+
+    def _wake(self) -> None:
+        # May run on any thread; call_later is the thread-safe way in.
+        self.call_later(self._flush_timer.resume)
 
     # -- public helpers ------------------------------------------------
 
     def write_output(self, text: str) -> None:
         """Write normal program output (e.g. from ``print()``)."""
-        self.write(Text(text))
+        self._pending.append(text)
 
     def write_error(self, text: str) -> None:
         """Write an error message highlighted in red."""
-        self.write(Text(text, style="bold red"))
+        self._pending.append(text, ERROR_STYLE)
 
     def write_status(self, text: str) -> None:
         """Write a status / info message in dim italic."""
-        self.write(Text(text, style="dim italic"))
+        self._pending.append(text, STATUS_STYLE)
+
+    def flush(self) -> None:
+        """Write the next batch of queued lines to the log now."""
+        batch = self._pending.drain()
+        if batch is not None:
+            self.write(batch)
+        else:
+            self._flush_timer.pause()
 
     def clear_console(self) -> None:
         """Remove all content from the console."""
+        self._pending.discard()
         self.clear()
@@ -2,13 +2,70 @@
 
 from __future__ import annotations
 
+from collections import deque
+from functools import cache
+
 from textual import on
 from textual.app import ComposeResult
 from textual.containers import Vertical
 from textual.message import Message
 from textual.widgets import Input, RichLog
+from rich.console import Group
+from rich.padding import Padding
+from rich.table import Table
 from rich.text import Text
 
+from neo_robot.ui.widgets.console import (
+    ERROR_STYLE,
+    FLUSH_INTERVAL,
+    HEADER_STYLE,
+    HINT_STYLE,
+    MAX_LINES,
+    PROMPT_STYLE,
+    STATUS_STYLE,
+    PendingLines,
+)
+
+# Oldest commands are dropped once the history holds this many entries.
+_HISTORY_SIZE = 500
+
+# Shared blank line for multi-part writes; rendering never mutates it.
+_BLANK = Text("")
+
+_HELP_API_LINES = (
+    "  arm.turn_left(angle)   - xoay tay trái",
+    "  arm.turn_right(angle)  - xoay tay phải",
+    "  arm.grab()             - kẹp lại",
+    "  arm.release()          - mở kẹp",
+    "  arm.lift_up(angle)     - xoay cẳng tay trái",
+    "  arm.lower_down(angle)  - xoay cẳng tay phải",
+    "  arm.set_angle(angle)   - đặt góc tuyệt đối",
+    "  delay(seconds)         - tạm dừng thực thi",
+    "  print(...)             - in giá trị",
+)
+
+_HELP_REPL_LINES = (
+    "  help     - hiển thị trợ giúp",
+    "  clear    - xóa bảng lệnh",
+    "  history  - xem lịch sử lệnh",
+)
+
+
+@cache
+def _help_text() -> Text:
+    """Build the ``help`` output once, as a single multi-line :class:`Text`."""
+    return Text("\n").join(
+        [
+            _BLANK,
+            Text("Các lệnh có sẵn:", style=HEADER_STYLE),
+            *(Text(line) for line in _HELP_API_LINES),
+            _BLANK,
+            Text("Lệnh REPL:", style=HEADER_STYLE),
+            *(Text(line) for line in _HELP_REPL_LINES),
+            _BLANK,
+        ]
+    )
+
 
 class CommandSubmitted(Message):
     """Posted when the user submits a command in the interactive console."""
@@ -35,7 +92,10 @@ class InteractiveConsole(Vertical):
 
     The widget posts a :class:`CommandSubmitted` message when the user
     presses Enter.  The parent screen is responsible for executing the
-    command and writing output back via the public helpers.
+    command and writing output back via the public helpers, which queue
+    text for a batched write every :data:`FLUSH_INTERVAL` seconds and are
+    safe to call from worker threads.  The timer is paused while nothing
+    is queued.
     """
 
     DEFAULT_CSS = """
@@ -58,19 +118,41 @@ class InteractiveConsole(Vertical):
         ("down", "history_next", "Lệnh tiếp theo"),
     ]
 
+    # Built-in REPL commands, handled here instead of being executed
+    _BUILTINS = {
+        "help": "_show_help",
+        "clear": "clear_log",
+        "history": "_show_history",
+    }
+
     def __init__(self, **kwargs) -> None:  # type: ignore[override]
         super().__init__(**kwargs)
-        self._history: list[str] = []
+        self._history: deque[str] = deque(maxlen=_HISTORY_SIZE)
         self._history_index: int = -1
+        self._pending = PendingLines(on_wake=self._wake)
 
     def compose(self) -> ComposeResult:
-        yield RichLog(id="repl-log", highlight=True, markup=True, wrap=True)
+        yield RichLog(
+            id="repl-log", highlight=True, markup=True, wrap=True, max_lines=MAX_LINES
+        )
         yield Input(placeholder="Nhập lệnh và nhấn Enter ...", id="repl-input")
 
     def on_mount(self) -> None:
-        log = self.query_one("#repl-log", RichLog)
-        log.write(Text("Chế độ tương tác (nhập từng lệnh một)", style="bold cyan"))
-        log.write(Text("Gõ 'help' để xem các lệnh có sẵn.\n", style="dim"))
+        self.query_one("#repl-log", RichLog).write(
+            Text.assemble(
+                ("Chế độ tương tác (nhập từng lệnh một)", HEADER_STYLE),
+                "\n",
+                ("Gõ 'help' để xem các lệnh có sẵn.\n", HINT_STYLE),
+            )
+        )
+        self._flush_timer = self.set_interval(FLUSH_INTERVAL, self.flush)
+
+    def on_unmount(self) -> None:
+        self._pending.close()
+
+    def _wake(self) -> None:
+        # May run on any thread; call_later is the thread-safe way in.
+        self.call_later(self._flush_timer.resume)
 
     # -- input handling -------------------------------------------------
 
@@ -84,23 +166,19 @@ class InteractiveConsole(Vertical):
         if not command:
             return
 
-        # Add to history
-        self._history.append(command)
+        # Add to history, skipping an immediate repeat (like HISTCONTROL=ignoredups)
+        if not self._history or self._history[-1] != command:
+            self._history.append(command)
         self._history_index = -1
 
-        # Echo the command in the log
-        log = self.query_one("#repl-log", RichLog)
-        log.write(Text(f">>> {command}", style="bold green"))
+        # Echo the command.  It is queued rather than written so that it
+        # shares one RichLog write with the command's first output.
+        self._pending.append(f">>> {command}", PROMPT_STYLE)
 
         # Handle built-in REPL commands
-        if command == "help":
-            self._show_help()
-            return
-        if command == "clear":
-            log.clear()
-            return
-        if command == "history":
-            self._show_history()
+        handler = self._BUILTINS.get(command)
+        if handler is not None:
+            getattr(self, handler)()
             return
 
         # Post message for the parent screen to execute
@@ -135,50 +213,62 @@ class InteractiveConsole(Vertical):
 
     def write_output(self, text: str) -> None:
         """Write normal output to the REPL log."""
-        log = self.query_one("#repl-log", RichLog)
-        log.write(Text(text))
+        self._pending.append(text)
 
     def write_error(self, text: str) -> None:
         """Write an error to the REPL log."""
-        log = self.query_one("#repl-log", RichLog)
-        log.write(Text(text, style="bold red"))
+        self._pending.append(text, ERROR_STYLE)
 
     def write_status(self, text: str) -> None:
         """Write a status message to the REPL log."""
-        log = self.query_one("#repl-log", RichLog)
-        log.write(Text(text, style="dim italic"))
+        self._pending.append(text, STATUS_STYLE)
+
+    def flush(self) -> None:
+        """Write the next batch of queued lines to the REPL log now."""
+        batch = self._pending.drain()
+        if batch is not None:
+            self.query_one("#repl-log", RichLog).write(batch)
+        else:
+            self._flush_timer.pause()
+
+    def clear_log(self) -> None:
+        """Remove all content from the REPL log."""
+        self._pending.discard()
+        self.query_one("#repl-log", RichLog).clear()
 
     # -- internal helpers -----------------------------------------------
 
-    def _show_help(self) -> None:
+    # Both write out everything queued first: they write to the log
+    # directly, after the echo.
+
+    def _flush_all(self) -> RichLog:
         log = self.query_one("#repl-log", RichLog)
-        log.write(Text(""))
-        log.write(Text("Các lệnh có sẵn:", style="bold cyan"))
-        log.write(Text("  arm.turn_left(angle)   - xoay tay trái"))
-        log.write(Text("  arm.turn_right(angle)  - xoay tay phải"))
-        log.write(Text("  arm.grab()             - kẹp lại"))
-        log.write(Text("  arm.release()          - mở kẹp"))
-        log.write(Text("  arm.lift_up(angle)     - xoay cẳng tay trái"))
-        log.write(Text("  arm.lower_down(angle)  - xoay cẳng tay phải"))
-        log.write(Text("  arm.set_angle(angle)   - đặt góc tuyệt đối"))
-        log.write(Text("  delay(seconds)         - tạm dừng thực thi"))
-        log.write(Text("  print(...)             - in giá trị"))
-        log.write(Text(""))
-        log.write(Text("Lệnh REPL:", style="bold cyan"))
-        log.write(Text("  help     - hiển thị trợ giúp"))
-        log.write(Text("  clear    - xóa bảng lệnh"))
-        log.write(Text("  history  - xem lịch sử lệnh"))
-        log.write(Text(""))
+        batch = self._pending.drain(limit=None)
+        if batch is not None:
+            log.write(batch)
+        return log
+
+    def _show_help(self) -> None:
+        self._flush_all().write(_help_text())
 
     def _show_history(self) -> None:
-        log = self.query_one("#repl-log", RichLog)
+        log = self._flush_all()
         if not self._history:
-            log.write(Text("Không có lệnh trong lịch sử.", style="dim"))
+            log.write(Text("Không có lệnh trong lịch sử.", style=HINT_STYLE))
             return
-        log.write(Text("Lịch sử lệnh:", style="bold cyan"))
+        # One grid for all entries, so the whole list is a single write
+        grid = Table.grid(padding=(0, 1))
+        grid.add_column(justify="right")
+        grid.add_column()
         for i, cmd in enumerate(self._history, 1):
-            log.write(Text(f"  {i}. {cmd}"))
-        log.write(Text(""))
+            grid.add_row(f"{i}.", Text(cmd))
+        log.write(
+            Group(
+                Text("Lịch sử lệnh:", style=HEADER_STYLE),
+                Padding(grid, (0, 0, 0, 2), expand=False),
+                _BLANK,
+            )
+        )
 
     def focus_input(self) -> None:
         """Focus the input field (useful when switching modes)."""
@@ -0,0 +1,157 @@
+"""Tests for stopping student programs in :class:`CodeExecutor`."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+
+import pytest
+
+from neo_robot.engine import CodeExecutor, ExecutionResult
+from neo_robot.engine.executor import _ExecutionStopped, _ExecutionTimeout
+from neo_robot.hardware.mock_arm import MockRobotArm
+
+PRINT_LOOP = "while True: print('x')"
+
+
+@pytest.fixture
+def logs() -> list[str]:
+    return []
+
+
+def make_executor(logs: list[str], timeout: float | None = None) -> CodeExecutor:
+    executor = CodeExecutor(MockRobotArm(), timeout=timeout)
+    executor.set_log_callback(logs.append)
+    return executor
+
+
+def run_in_thread(executor: CodeExecutor, code: str) -> tuple[threading.Thread, list]:
+    results: list[ExecutionResult] = []
+    thread = threading.Thread(
+        target=lambda: results.append(executor.execute(code)), daemon=True
+    )
+    thread.start()
+    return thread, results
+
+
+def assert_still_usable(executor: CodeExecutor, logs: list[str]) -> None:
+    logs.clear()
+    result = executor.execute("print('done')\narm.turn_right(10)")
+    assert result.success, result.error
+    assert result.output == "done\n"
+    assert "done\narm.turn_right(10)" in "\n".join(logs)
+
+
+def test_interrupt_during_print_loop(logs: list[str]) -> None:
+    executor = make_executor(logs)
+    rng = random.Random(0)
+    for _ in range(20):
+        thread, results = run_in_thread(executor, PRINT_LOOP)
+        time.sleep(rng.uniform(0.005, 0.023))
+        executor.interrupt()
+        thread.join(5)
+        assert not thread.is_alive(), "interrupted run did not finish"
+        assert not results[0].success
+        assert _ExecutionStopped.message in results[0].error
+    assert_still_usable(executor, logs)
+
+
+def test_timeout_during_print_loop(logs: list[str]) -> None:
+    executor = make_executor(logs, timeout=0.05)
+    for _ in range(5):
+        thread, results = run_in_thread(executor, PRINT_LOOP)
+        thread.join(5)
+        assert not thread.is_alive(), "timed-out run did not finish"
+        assert not results[0].success
+        assert _ExecutionTimeout.message in results[0].error
+    assert_still_usable(executor, logs)
+
+
+def test_interrupt_swallowed_by_bare_except(logs: list[str]) -> None:
+    executor = make_executor(logs)
+    code = "while True:\n    try:\n        print('x')\n    except:\n        pass"
+    thread, results = run_in_thread(executor, code)
+    time.sleep(0.05)
+    executor.interrupt()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert _ExecutionStopped.message in results[0].error
+    assert_still_usable(executor, logs)
+
+
+def test_interrupt_during_delay(logs: list[str]) -> None:
+    executor = make_executor(logs)
+    thread, results = run_in_thread(executor, "delay(60)")
+    time.sleep(0.05)
+    start = time.monotonic()
+    executor.interrupt()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert time.monotonic() - start < 1
+    assert _ExecutionStopped.message in results[0].error
+    assert_still_usable(executor, logs)
+
+
+def test_interrupt_during_repl_print_loop(logs: list[str]) -> None:
+    executor = make_executor(logs)
+    results: list[ExecutionResult] = []
+    thread = threading.Thread(
+        target=lambda: results.append(executor.execute_line(PRINT_LOOP)), daemon=True
+    )
+    thread.start()
+    time.sleep(0.02)
+    executor.interrupt()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert results[0].error == _ExecutionStopped.message
+    assert executor.execute_line("print(1 + 1)").output == "2\n"
+
+
+def test_full_log_buffer_blocks_until_stopped() -> None:
+    executor = CodeExecutor(MockRobotArm())
+    release = threading.Event()
+    delivered: list[str] = []
+
+    def stuck_callback(msg: str) -> None:
+        release.wait(10)
+        delivered.append(msg)
+
+    executor.set_log_callback(stuck_callback)
+    thread, results = run_in_thread(executor, PRINT_LOOP)
+    time.sleep(0.1)
+    executor.interrupt()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert _ExecutionStopped.message in results[0].error
+    release.set()
+
+
+def test_failing_log_callback_is_logged(caplog: pytest.LogCaptureFixture) -> None:
+    executor = CodeExecutor(MockRobotArm())
+    calls: list[str] = []
+
+    def callback(msg: str) -> None:
+        calls.append(msg)
+        if len(calls) == 1:
+            raise RuntimeError("renderer broke")
+
+    executor.set_log_callback(callback)
+    assert executor.execute("print('a')").success
+    assert executor.execute("print('b')").success
+    assert calls == ["a", "b"]
+    assert "renderer broke" in caplog.text
+
+
+def test_on_start_only_for_accepted_runs(logs: list[str]) -> None:
+    executor = make_executor(logs)
+    started: list[str] = []
+    thread, results = run_in_thread(executor, "while True: pass")
+    time.sleep(0.05)
+    refused = executor.execute_line("print(1)", on_start=lambda: started.append("b"))
+    assert not refused.success
+    assert started == []
+    executor.interrupt()
+    thread.join(5)
+    assert executor.execute("x = 1", on_start=lambda: started.append("c")).success
+    assert started == ["c"]